@@ -3,14 +3,30 @@ import os
 import re
 import subprocess
 import sys
+import threading
+from collections.abc import Sequence
 from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
+from hpc_funcs.schedulers.uge.environment import _has_uge
 from hpc_funcs.shell import which
 
 logger = logging.getLogger("lmod")
 
+# LMOD bookkeeping variables and python boilerplate in `lmod python` output
+_NOISE_RE = re.compile(rb"import|__LM|_LMFILES_|_ModuleTable")
+_KV_RE = re.compile(rb'^os\.environ\["([^"]+)"\]\s*=\s*"(.*)"\s*;?\s*$', re.MULTILINE)
+
+# Entries in `module list`, with optional markers, e.g. (H) for hidden modules
+_MODULE_RE = re.compile(r"(\d+)\)\s+(\S+)((?:\s+\([A-Za-z]+\))*)")
+
+# Serializes environment changes, so concurrent loads do not work on stale copies of os.environ
+_LOCK = threading.Lock()
+
+# `module list` result, keyed on the environment that lmod keeps the active modules in
+_modules_cache: tuple[tuple[str | None, str | None], dict[int, str]] | None = None
+
 
 @lru_cache
 def get_lmod_executable() -> Path:
@@ -39,7 +55,7 @@ def get_lmod_executable() -> Path:
 # pylint: disable=too-many-locals
 def module(
     command: str,
-    arguments: str,
+    arguments: str | Sequence[str],
     cmd: Path | None = None,
     env: dict[str, str] | None = None,
 ) -> tuple[dict[str, str], str | None]:
@@ -47,8 +63,9 @@ def module(
 
     Args:
         command: LMOD command (e.g., "load", "list", "use")
-        arguments: Arguments for the command
-        cmd: Path to lmod executable (defaults to auto-detected)
+        arguments: Argument, or list of arguments, for the command
+        cmd: Path to lmod executable (defaults to auto-detected at call time, not import)
+        env: Environment to run lmod in (defaults to a copy of os.environ)
 
     Returns:
         Tuple of (environment_updates dict, stderr string)
@@ -59,9 +76,10 @@ def module(
     if cmd is None:
         cmd = get_lmod_executable()
 
-    logger.info(f"module {command} {arguments}")
+    _arguments = [arguments] if isinstance(arguments, str) else list(arguments)
 
-    execution: Any = [cmd, "python", command, arguments]
+    logger.info(f"module {command} {' '.join(_arguments)}")
+    execution: Any = [cmd, "python", command, *_arguments]
 
     logger.debug(execution)
     if env is None:
@@ -71,67 +89,22 @@ def module(
     result = subprocess.run(
         execution,
         capture_output=True,
-        text=True,
         check=False,
         env=env,
     )
 
-    stdout = result.stdout
-    stderr = result.stderr
+    stderr = result.stderr.decode("utf-8")
 
-    if "error" in stderr:
+    # `module list` writes to stderr, so only trust the exit status
+    if result.returncode != 0:
         raise RuntimeError(f"LMOD error: {stderr}")
 
-    # pylint: disable=too-many-return-statements
-    def _filter(line: str) -> bool:
-        """
-        I just want to remove the noise, so I can see what changes
-        """
-
-        if "import" in line:
-            return False
-
-        if "os.environ" not in line:
-            return False
-
-        if "__LM" in line:
-            return False
-
-        if "__LMFILES__" in line:
-            return False
-
-        if "_LMFILES_" in line:
-            return False
-
-        return "_ModuleTable" not in line
-
-    def _split_line(line: str) -> tuple[str, str]:
-        # format:
-        # os.environ["key"] = "value:value"
-
-        _line = line.split("=")
-
-        value = _line[-1]
-        value = value.strip()
-
-        if value[-1] == ";":
-            value = value[:-1]
-
-        value = value[1:-1]
-
-        key = _line[0]
-        key = key.strip()
-        key = key.replace("os.environ", "")
-        key = key[2:-2]
-
-        return key, value
-
-    # Filter some of the lines
-    lines = stdout.split("\n")
-    lines = [line for line in lines if _filter(line)]
-    keyvalues = [_split_line(line) for line in lines]
-
-    environment_update = dict(keyvalues)
+    # Scan the raw output and only decode the lines that are not noise
+    environment_update = {
+        match.group(1).decode("utf-8"): match.group(2).decode("utf-8")
+        for match in _KV_RE.finditer(result.stdout)
+        if _NOISE_RE.search(match.group(0)) is None
+    }
 
     return environment_update, stderr
 
@@ -141,17 +114,21 @@ def update_environment(update_dict: dict[str, str]) -> None:
 
     os.environ.update(update_dict)
 
+    # Commands found on PATH may have changed
+    _has_uge.cache_clear()
+
     for key, value in update_dict.items():
         logger.debug(f"{key} = {value}")
 
     if pythonpath is None:
         return
 
-    pythonpaths = pythonpath.split(":")
+    existing = set(sys.path)
 
-    for path in pythonpaths:
-        if path in sys.path:
+    for path in pythonpath.split(":"):
+        if path in existing:
             continue
+        existing.add(path)
         sys.path.append(path)
 
     return
@@ -165,8 +142,14 @@ def purge() -> None:
 
 def load(module_name: str, env: dict[str, str] | None = None) -> None:
     """use `module load` to overload your environment"""
-    update_dict = get_load_environment(module_name, env=env)
-    update_environment(update_dict)
+    load_many([module_name], env=env)
+
+
+def load_many(module_names: Sequence[str], env: dict[str, str] | None = None) -> None:
+    """use a single `module load` for several modules to overload your environment"""
+    with _LOCK:
+        update_dict, _ = module("load", module_names, env=env)
+        update_environment(update_dict)
 
 
 def get_load_environment(module_name: str, env: dict[str, str] | None = None) -> dict[str, str]:
@@ -177,64 +160,54 @@ def get_load_environment(module_name: str, env: dict[str, str] | None = None) ->
 
 def use(path: Path | str) -> None:
     """Use path in MODULEPATH"""
-    update_dict, _ = module("use", str(path))
-    update_environment(update_dict)
+    with _LOCK:
+        update_dict, _ = module("use", str(path))
+        update_environment(update_dict)
 
 
 def get_modules() -> dict[int, str]:
     """Return all active LMOD modules.
 
-    Hidden modules are ignored.
+    Hidden modules are ignored. The result is cached while LOADEDMODULES and MODULEPATH are
+    unchanged, however the environment was updated.
 
     returns:
         dict[number, modulename/version]
 
     """
 
-    _, stderr = module("list", "")
+    global _modules_cache
 
-    if stderr is None:
-        raise RuntimeError("LMOD module list returned no output")
+    # Under the lock, so a concurrent load cannot change the environment between key and list
+    with _LOCK:
+        key = (os.environ.get("LOADEDMODULES"), os.environ.get("MODULEPATH"))
 
-    lines = stderr.split("\n")
+        if _modules_cache is not None and _modules_cache[0] == key:
+            return dict(_modules_cache[1])
 
-    def _filter(line: str):
-        # Format: 1) name/version     10) name/version
+        _, stderr = module("list", "")
 
-        if not len(line.strip()):
-            return False
+        if stderr is None:
+            raise RuntimeError("LMOD module list returned no output")
 
-        if line[0] != " ":
-            return False
+        # Format: 1) name/version     10) name/version (H)
+        modules = {
+            int(match.group(1)): match.group(2)
+            for match in _MODULE_RE.finditer(stderr)
+            if "(H)" not in match.group(3)
+        }
 
-        return ")" in line
+        _modules_cache = (key, modules)
 
-    # Filter to only lines with modules
-    lines = [line for line in lines if _filter(line)]
-
-    modules = {}
-    for line in lines:
-        # Standardize the line
-        line = " ".join(line.strip().split())
-
-        pattern = r"(\d+\))"
-        mods = re.split(pattern, line)
-        mods = [x.strip() for x in mods if len(x)]
-
-        # The delimiters are kept, so select every second
-        for key, mod in zip(mods[::2], mods[1::2], strict=False):
-            if "(H)" in mod:
-                continue
-
-            key = key.replace(")", "")
-            _key = int(key)
-            modules[_key] = mod
-
-    return modules
+    return dict(modules)
 
 
 def get_paths() -> list[str]:
     """Return all LMOD paths in use"""
     paths = os.environ.get("MODULEPATH", "")
-    paths_ = paths.split(":")
-    return paths_
+    return list(_split_paths(paths))
+
+
+@lru_cache(maxsize=8)
+def _split_paths(paths: str) -> tuple[str, ...]:
+    return tuple(paths.split(":"))
@@ -7,18 +7,20 @@ COLUMN_TASKARRAY = "job-array tasks"
 # TODO Move to qstat.py and qrsh.py
 FLAG_SYNC = "-sync y"
 
-TAGS_PENDING = ["qw", "hqw", "hRwq"]
-TAGS_RUNNING = ["r", "t", "Rr", "Rt", "x"]
-TAGS_SUSPENDED = ["s", "ts", "S", "tS", "T", "tT", "Rs", "Rts", "RS", "RtS", "RT", "RtT"]
-TAGS_ERROR = ["Eqw", "Ehqw", "EhRqw"]
-TAGS_DELETED = ["dr", "dt", "dRr", "dRt", "ds", "dS", "dT", "dRs", "dRS", "dRT"]
+TAGS_PENDING = frozenset({"qw", "hqw", "hRwq"})
+TAGS_RUNNING = frozenset({"r", "t", "Rr", "Rt", "x"})
+TAGS_SUSPENDED = frozenset(
+    {"s", "ts", "S", "tS", "T", "tT", "Rs", "Rts", "RS", "RtS", "RT", "RtT"}
+)
+TAGS_ERROR = frozenset({"Eqw", "Ehqw", "EhRqw"})
+TAGS_DELETED = frozenset({"dr", "dt", "dRr", "dRt", "ds", "dS", "dT", "dRs", "dRS", "dRT"})
 
 TASK_ENVIRONMENT_VARIABLE = "$SGE_TASK_ID"
 
 UGE_TMPDIR = "TMPDIR"
 UGE_CORES = "NSLOTS"
 
-UGE_ENVIRONMENT_VARIABLES = [
+UGE_ENVIRONMENT_VARIABLES = (
     "ARC",
     "SGE_ROOT",
     "SGE_BINARY_PATH",
@@ -62,8 +64,8 @@ UGE_ENVIRONMENT_VARIABLES = [
     "VECLIB_MAXIMUM_THREADS",
     "MKL_NUM_THREADS",
     "NUMEXPR_NUM_THREADS",
-    "HOSTNAME",
-]
+)
+UGE_ENVIRONMENT_VARIABLES_SET = frozenset(UGE_ENVIRONMENT_VARIABLES)
 
 UGE_COMMANDS = [
     "qacct",
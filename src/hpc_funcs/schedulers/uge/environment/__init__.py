@@ -1,5 +1,7 @@
 import os
+import re
 import shutil
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
@@ -9,15 +11,25 @@ from ..constants import UGE_ENVIRONMENT_VARIABLES
 
 COMMAND_SUBMIT = "qsub"
 
+# `env` output lines, and the shell's own variables to ignore when sourcing
+_ENV_LINE_RE = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)=(.*)$", re.MULTILINE)
+_SOURCE_SKIP = frozenset({"PWD", "_", "SHLVL"})
+
 
 def has_uge() -> bool:
     """Check if cluster has UGE setup"""
+    # PATH can change at runtime, e.g. by lmod.load, so the lookup is cached per PATH
+    return _has_uge(os.environ.get("PATH"))
+
 
-    cmd = shutil.which(COMMAND_SUBMIT)
+@lru_cache
+def _has_uge(path: str | None) -> bool:
+    cmd = shutil.which(COMMAND_SUBMIT, path=path)
 
     return cmd is not None
 
 
+@lru_cache
 def is_job() -> bool:
     """Check if runtime is a UGE queue environment"""
 
@@ -34,16 +46,19 @@ def get_env() -> dict[str, str | None]:
         NSLOTS - Number of cores in current job
         TMPDIR - Node specific tmpdir
 
+    The UGE variables are set at job start, so they are only read once per process.
     """
+    return dict(_get_env())
 
-    properties = {}
 
-    for key in UGE_ENVIRONMENT_VARIABLES:
-        properties[key] = os.getenv(key)
-
-    return properties
+@lru_cache
+def _get_env() -> dict[str, str | None]:
+    # Plain dict snapshot, so the lookups below skip the os.environ wrapper
+    env = dict(os.environ)
+    return {key: env.get(key) for key in UGE_ENVIRONMENT_VARIABLES}
 
 
+@lru_cache
 def get_tmpdir() -> Path:
     """From UGE environment, get scratch directory.
 
@@ -73,7 +88,11 @@ def get_config() -> dict[str, Any]:
     Raises:
         RuntimeError: If required UGE environment variables are not set.
     """
+    return dict(_get_config())
+
 
+@lru_cache
+def _get_config() -> dict[str, Any]:
     n_cores = os.getenv("NSLOTS")
     scr = os.getenv("TMPDIR")
     hostname = os.getenv("HOSTNAME")
@@ -94,6 +113,7 @@ def get_config() -> dict[str, Any]:
     return config
 
 
+@lru_cache
 def get_cores() -> int:
     """Get available cores in current environment.
 
@@ -111,6 +131,7 @@ def get_cores() -> int:
     return n_cores_
 
 
+@lru_cache
 def is_interactive():
     """Check if job is run via interactive shell (e.i. qrsh), or submission"""
 
@@ -137,30 +158,9 @@ def source(bashfile):
 
     cmd = f'env -i sh -c "source {bashfile} && env"'
     stdout, _ = execute(cmd)
-    lines = stdout.split("\n")
-
-    variables = {}
-
-    for line in lines:
-        line = line.split("=")
-
-        # Ignore wrong lines
-        # - empty
-        # - multiple =
-        if len(line) != 2:
-            continue
 
-        key, var = line
-
-        if key == "PWD":
-            continue
-
-        if key == "_":
-            continue
-
-        if key == "SHLVL":
-            continue
-
-        variables[key] = var
-
-    return variables
+    return {
+        match.group(1): match.group(2)
+        for match in _ENV_LINE_RE.finditer(stdout)
+        if match.group(1) not in _SOURCE_SKIP
+    }
@@ -1,4 +1,3 @@
-import copy
 import logging
 import time
 from collections import defaultdict
@@ -8,7 +7,13 @@ from typing import Any
 from hpc_funcs.schedulers.uge.constants import TAGS_RUNNING
 from hpc_funcs.schedulers.uge.qstat import get_all_jobs_text
 from hpc_funcs.schedulers.uge.qstat_json import get_qstat_job_json
-from hpc_funcs.schedulers.uge.qstat_text import COLUMN_SLOTS, COLUMN_STATE, COLUMN_USER
+from hpc_funcs.schedulers.uge.qstat_text import (
+    COLUMN_JOBID,
+    COLUMN_SLOTS,
+    COLUMN_STATE,
+    COLUMN_USER,
+    get_qstat_text,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,17 +29,13 @@ def get_cluster_usage() -> dict[str, int]:
         >>> total_cores = sum(usage.values())
     """
 
-    jobs = get_all_jobs_text()
-
-    # Filter to running jobs only
-    running_jobs = [j for j in jobs if j.get(COLUMN_STATE) in TAGS_RUNNING]
-
-    # Group by user and sum slots
+    # Sum slots of running jobs per user in a single pass
     counts: dict[str, int] = defaultdict(int)
-    for job in running_jobs:
+    for job in get_all_jobs_text():
+        if job.get(COLUMN_STATE) not in TAGS_RUNNING:
+            continue
         user = job.get(COLUMN_USER, "unknown")
-        slots = int(job.get(COLUMN_SLOTS, 0))
-        counts[user] += slots
+        counts[user] += int(job.get(COLUMN_SLOTS, 0))
 
     # Sort by count and return as regular dict
     return dict(sorted(counts.items(), key=lambda x: x[1]))
@@ -47,7 +48,8 @@ def wait_for_jobs(jobs: list[str], sleep: int = 60) -> Iterator[str]:
 
     start_time = time.time()
 
-    jobs = copy.deepcopy(jobs)
+    # qstat lists job ids as strings
+    jobs = [str(job_id) for job_id in jobs]
 
     while len(jobs):
         logger.info(
@@ -56,21 +58,29 @@ def wait_for_jobs(jobs: list[str], sleep: int = 60) -> Iterator[str]:
 
         time.sleep(sleep)
 
-        rm_list = []
+        # One qstat call per cycle, regardless of the number of jobs
+        active = get_active_job_ids()
 
-        for job_id in jobs:
-            if is_job_done(job_id):
-                yield job_id
-                rm_list.append(job_id)
+        yield from (job_id for job_id in jobs if job_id not in active)
 
-        for job_id in rm_list:
-            jobs.remove(job_id)
+        jobs = [job_id for job_id in jobs if job_id in active]
 
     end_time = time.time()
     diff_time = end_time - start_time
     logger.info(f"All jobs finished and took {diff_time / 60 / 60:.2f}h")
 
 
+def get_active_job_ids() -> set[str]:
+    """Get the ids of all jobs of the current user still known to qstat.
+
+    A single qstat call covers every job, so polling many jobs costs one subprocess.
+    """
+
+    jobs = get_qstat_text()
+
+    return {job[COLUMN_JOBID] for job in jobs}
+
+
 def is_job_done(
     job_id: str,
 ) -> bool:
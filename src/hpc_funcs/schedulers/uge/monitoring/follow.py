@@ -4,14 +4,13 @@ import time
 from io import StringIO
 from typing import Any
 
-import tqdm
-
 from hpc_funcs.schedulers.uge.qstat_text import (
     COLUMN_ERROR,
     COLUMN_JOBID,
     COLUMN_PENDING,
     COLUMN_RUNNING,
-    parse_taskarray,
+    TASK_RANGE_RE,
+    index_taskarray,
 )
 
 from ..qstat import get_all_jobs_text
@@ -23,13 +22,34 @@ TQDM_OPTIONS = {
     "ncols": TQDM_LENGTH,
 }
 
+# Number of tasks by job id, static for a job, so rebuilt bars do not parse the range again
+_TOTAL_CACHE: dict[str, int] = {}
+
 logger = logging.getLogger(__name__)
 
 
 def get_time_from_ugestr(time_str: str) -> float:
-    _time = ".".join(time_str.split(".")[:-1])
-    time_ = datetime.datetime.strptime(_time, DATE_FORMAT)
-    return time.mktime(time_.timetuple())
+    """Convert UGE time, e.g. "11/15/2025 16:02:55.363", to seconds since epoch (local time)"""
+    _time = time_str.partition(".")[0]
+
+    # Fixed-width DATE_FORMAT, so slice it instead of going through strptime
+    try:
+        time_tuple = (
+            int(_time[6:10]),
+            int(_time[0:2]),
+            int(_time[3:5]),
+            int(_time[11:13]),
+            int(_time[14:16]),
+            int(_time[17:19]),
+            0,
+            0,
+            -1,
+        )
+    except ValueError:
+        time_ = datetime.datetime.strptime(_time, DATE_FORMAT)
+        return time.mktime(time_.timetuple())
+
+    return time.mktime(time_tuple)
 
 
 class TaskarrayProgress:
@@ -54,13 +74,13 @@ class TaskarrayProgress:
         self.position = position
         self.file = file
         self.job_id: str
+        self._last_state: tuple[int, int, int] | None = None
         self.init_bar(job_info, {})
 
     @staticmethod
-    def _read_time(timestamp):
-        time_start = datetime.datetime.fromtimestamp(int(timestamp) / 1000)
-        time_start = time.mktime(time_start.timetuple())
-        return time_start
+    def _read_time(timestamp) -> float:
+        """Milliseconds since epoch to seconds since epoch"""
+        return float(timestamp) / 1000.0
 
     def init_bar(self, job_info: dict, job_status: dict) -> None:
         is_xml = job_info.get("JB_ja_structure") is not None
@@ -79,35 +99,43 @@ class TaskarrayProgress:
 
         # TODO Move submission_time to constant from format
 
-        timestamp: str = (
+        timestamp: str | None = (
             job_info.get("submission_time") if is_json else job_info.get("JB_submission_time")
-        )  # type: ignore
+        )
         if timestamp is None:
             raise ValueError("Could not extract timestamp from job_info")
         time_start = get_time_from_ugestr(timestamp) if is_json else self._read_time(timestamp)
 
-        # Handle both XML format (JB_ja_structure) and text format (job-array tasks)
-        if is_xml:
-            # XML format: list of dicts with RN_min, RN_max, RN_step
-            job_array_info = job_info.get("JB_ja_structure")
-            if job_array_info is None:
-                raise ValueError("JB_ja_structure not found in XML job_info")
-            job_array_stop = int(job_array_info[0].get("RN_max", 1))
-        else:
-            # Text format: "start-stop:step" string like "1-2:1"
-            job_array_str = job_info.get("job-array tasks")
-            if job_array_str is None:
-                raise ValueError("job-array tasks not found in text job_info")
-            # Parse "1-2:1" format
-            parts = job_array_str.split(":")
-            range_parts = parts[0].split("-")
-            job_array_stop = int(range_parts[1]) if len(range_parts) > 1 else int(range_parts[0])
+        job_array_stop = _TOTAL_CACHE.get(job_id)
+
+        if job_array_stop is None:
+            # Handle both XML format (JB_ja_structure) and text format (job-array tasks)
+            if is_xml:
+                # XML format: list of dicts with RN_min, RN_max, RN_step
+                job_array_info = job_info.get("JB_ja_structure")
+                if job_array_info is None:
+                    raise ValueError("JB_ja_structure not found in XML job_info")
+                job_array_stop = int(job_array_info[0].get("RN_max", 1))
+            else:
+                # Text format: "start-stop:step" string like "1-2:1"
+                job_array_str = job_info.get("job-array tasks")
+                if job_array_str is None:
+                    raise ValueError("job-array tasks not found in text job_info")
+                match = TASK_RANGE_RE.match(job_array_str)
+                if match is None:
+                    raise ValueError(f"Could not parse job-array tasks: {job_array_str}")
+                job_array_stop = int(match.group(2) or match.group(1))
+
+            _TOTAL_CACHE[job_id] = job_array_stop
 
         self.n_total = job_array_stop
 
         # Set title
         self.title = job_id
 
+        # Deferred, so importing the monitoring helpers does not pay for tqdm
+        import tqdm
+
         self.pbar = tqdm.tqdm(
             total=self.n_total,
             desc=f"{self.title}",
@@ -120,45 +148,70 @@ class TaskarrayProgress:
         # Reset time
         self.pbar.last_print_t = self.pbar.start_t = time_start
 
-    def update(self, joblist: list[dict[str, Any]] | None = None) -> None:
+    def update(
+        self, joblist: list[dict[str, Any]] | dict[str, dict[str, Any]] | None = None
+    ) -> tuple[int, int, int]:
+        """Update the bar from parsed task-array rows.
+
+        `joblist` is either the list from `parse_taskarray` or the dict by job id from
+        `index_taskarray`. If not given, qstat is called.
+
+        Returns the state as (n_running, n_pending, n_error).
+        """
         if joblist is None:
             jobs = get_all_jobs_text()
-            joblist = parse_taskarray(jobs)
+            joblist = index_taskarray(jobs)
 
-        # Get status - find matching job in the list
-        matching_jobs = [j for j in joblist if j.get(COLUMN_JOBID) == self.job_id]
+        # Get status - find matching job, O(1) when given the job id index
+        job: dict[str, Any] | None
+        if isinstance(joblist, dict):
+            job = joblist.get(self.job_id)
+        else:
+            job = next((j for j in joblist if j.get(COLUMN_JOBID) == self.job_id), None)
 
         n_running: int
         n_pending: int
         n_error: int
         n_finished: int
 
-        if not len(matching_jobs):
+        if job is None:
             n_running = 0
             n_pending = 0
             n_error = 0
             n_finished = self.n_total
         else:
-            job = matching_jobs[0]
             n_running = int(job.get(COLUMN_RUNNING, 0))
             n_pending = int(job.get(COLUMN_PENDING, 0))
             n_error = int(job.get(COLUMN_ERROR, 0))
             n_finished = self.n_total - n_pending - n_running
 
-        postfix = {}
+        state = (n_running, n_pending, n_error)
+
+        # Nothing to redraw
+        if state == self._last_state:
+            return state
 
-        if n_error > 0:
-            postfix["err"] = n_error
+        last_state = self._last_state
+        self._last_state = state
 
-        self.pbar.set_postfix(postfix)
+        # Only touch the parts that changed, and render once
+        if last_state is None or n_error != last_state[2]:
+            postfix = {"err": n_error} if n_error > 0 else {}
+            self.pbar.set_postfix(postfix, refresh=False)
+
+        if last_state is None or n_running != last_state[0]:
+            self.pbar.set_description(f"{self.title} ({n_running})", refresh=False)
 
-        self.pbar.set_description(f"{self.title} ({n_running})", refresh=False)
         self.pbar.n = n_finished
         self.pbar.refresh()
 
+        return state
+
     def finish(self) -> None:
         n_total = self.n_total
-        self.pbar.set_postfix({})
+        self._last_state = None
+        _TOTAL_CACHE.pop(self.job_id, None)
+        self.pbar.set_postfix({}, refresh=False)
         self.pbar.set_description(f"{self.title} (0)", refresh=False)
         self.pbar.n = n_total
         self.pbar.refresh()
@@ -168,3 +221,102 @@ class TaskarrayProgress:
 
     def close(self) -> None:
         self.pbar.close()
+
+
+class PollSchedule:
+    """Exponential backoff between polls.
+
+    The interval grows by `factor` while nothing changes, up to `maximum`, and is reset to
+    `minimum` on any state change.
+    """
+
+    def __init__(self, minimum: float = 2, maximum: float = 60, factor: float = 2) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.factor = factor
+        self.interval = minimum
+
+    def next_interval(self, state_changed: bool) -> float:
+        if state_changed:
+            self.interval = self.minimum
+        else:
+            self.interval = min(self.interval * self.factor, self.maximum)
+
+        return self.interval
+
+
+class FollowGroup:
+    """Follow several task-array jobs, with a single qstat call per poll for all bars.
+
+    Polls every `poll_interval` seconds, or with backoff if a `PollSchedule` is given.
+
+    Example:
+        group = FollowGroup.by_jobids(["12345", "12346"], schedule=PollSchedule())
+        group.run()
+        group.close()
+    """
+
+    @staticmethod
+    def by_jobids(
+        job_ids: list[str],
+        poll_interval: float = 60,
+        schedule: PollSchedule | None = None,
+        file: StringIO | None = None,
+    ) -> "FollowGroup":
+        bars = [
+            TaskarrayProgress.by_jobid(job_id, position=position, file=file)
+            for position, job_id in enumerate(job_ids)
+        ]
+        return FollowGroup(bars, poll_interval=poll_interval, schedule=schedule)
+
+    def __init__(
+        self,
+        bars: list[TaskarrayProgress] | None = None,
+        poll_interval: float = 60,
+        schedule: PollSchedule | None = None,
+    ) -> None:
+        self.bars = list(bars) if bars is not None else []
+        self.poll_interval = poll_interval
+        self.schedule = schedule
+        self._states: dict[str, tuple[int, int, int]] = {}
+
+    def add(self, bar: TaskarrayProgress) -> None:
+        self.bars.append(bar)
+
+    def poll(self) -> bool:
+        """Call qstat once and update every bar from the same output.
+
+        Returns True if the state of any bar changed since the last poll.
+        """
+        jobs = get_all_jobs_text()
+        index = index_taskarray(jobs)
+
+        changed = False
+
+        for bar in self.bars:
+            state = bar.update(joblist=index)
+            if self._states.get(bar.job_id) != state:
+                changed = True
+            self._states[bar.job_id] = state
+
+        return changed
+
+    def run(self) -> None:
+        """Poll until all jobs are finished"""
+        changed = self.poll()
+
+        while not self.is_finished():
+            interval = (
+                self.poll_interval
+                if self.schedule is None
+                else self.schedule.next_interval(changed)
+            )
+            time.sleep(interval)
+            changed = self.poll()
+
+    def is_finished(self) -> bool:
+        return all(bar.is_finished() for bar in self.bars)
+
+    def close(self) -> None:
+        for bar in self.bars:
+            bar.close()
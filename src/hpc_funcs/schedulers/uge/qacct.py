@@ -4,16 +4,17 @@ import subprocess
 logger = logging.getLogger(__name__)
 
 COL_SPLIT = 13
+SEPARATOR = "=" * 11
 
 
 def get_job_accounting(job_id: str) -> list[dict[str, str]]:
-    cmd = f"qacct -j {job_id}"
+    cmd = ["qacct", "-j", str(job_id)]
+    logger.debug(" ".join(cmd))
 
     process = subprocess.run(
         cmd,
         encoding="utf-8",
         capture_output=True,
-        shell=True,
     )
 
     stdout = process.stdout
@@ -35,24 +36,18 @@ def parse_qacct(stdout: str) -> list[dict[str, str]]:
 
     output: list[dict[str, str]] = [{}]
 
-    lines = stdout.split("\n")
-
-    for line in lines:
-        if "===========" in line:
+    for line in stdout.splitlines():
+        if line.startswith(SEPARATOR):
             if len(output[-1]) > 1:
                 output += [{}]
             continue
 
         # Format: pe_taskid     NONE
         key = line[:COL_SPLIT].strip()
-        value = line[COL_SPLIT:].strip()
 
         if len(key) == 0:
             continue
 
-        key = key.strip()
-        value = value.strip()
-
-        output[-1][key] = value
+        output[-1][key] = line[COL_SPLIT:].strip()
 
     return output
@@ -1,8 +1,12 @@
 import logging
 import subprocess
+from collections.abc import Sequence
 
 logger = logging.getLogger(__name__)
 
+# Job ids per qdel call, to stay well below ARG_MAX
+QDEL_CHUNK = 500
+
 
 def delete_job(job_id: str) -> None:
     """Delete a UGE job.
@@ -13,26 +17,43 @@ def delete_job(job_id: str) -> None:
     Raises:
         RuntimeError: If qdel command fails.
     """
+    delete_jobs([job_id])
+
+
+def delete_jobs(job_ids: Sequence[str], chunk: int = QDEL_CHUNK) -> None:
+    """Delete several UGE jobs, with one qdel call per `chunk` job ids.
+
+    Args:
+        job_ids: The job IDs to delete.
+        chunk: Max number of job IDs per qdel call.
+
+    Raises:
+        RuntimeError: If a qdel command fails.
+    """
+
+    job_ids = [str(job_id) for job_id in job_ids]
+
+    for i in range(0, len(job_ids), chunk):
+        _job_ids = job_ids[i : i + chunk]
 
-    cmd = f"qdel {job_id}"
-    logger.debug(cmd)
+        cmd = ["qdel", *_job_ids]
+        logger.debug(" ".join(cmd))
 
-    process = subprocess.run(
-        cmd,
-        encoding="utf-8",
-        capture_output=True,
-        shell=True,
-    )
+        process = subprocess.run(
+            cmd,
+            encoding="utf-8",
+            capture_output=True,
+        )
 
-    stdout = process.stdout.strip()
-    stderr = process.stderr.strip()
+        stdout = process.stdout.strip()
+        stderr = process.stderr.strip()
 
-    # Check for errors
-    if process.returncode != 0:
-        raise RuntimeError(f"qdel failed for job {job_id}: {stderr or stdout}")
+        # Check for errors
+        if process.returncode != 0:
+            raise RuntimeError(f"qdel failed for jobs {' '.join(_job_ids)}: {stderr or stdout}")
 
-    # Log output for debugging
-    if stderr:
-        logger.warning(f"qdel stderr: {stderr}")
-    if stdout:
-        logger.debug(f"qdel stdout: {stdout}")
+        # Log output for debugging
+        if stderr:
+            logger.warning(f"qdel stderr: {stderr}")
+        if stdout:
+            logger.debug(f"qdel stdout: {stdout}")
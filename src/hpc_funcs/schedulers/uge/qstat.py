@@ -1,4 +1,9 @@
+import functools
 import logging
+import os
+import threading
+import time
+from collections.abc import Callable
 from typing import Any
 
 from .qstat_json import get_qstat_json
@@ -6,16 +11,95 @@ from .qstat_text import get_qstat_text
 
 logger = logging.getLogger(__name__)
 
+# Seconds a full qstat listing is reused, to avoid hammering qmaster from polling loops
+QSTAT_TTL_ENVIRON = "HPC_FUNCS_QSTAT_TTL"
+QSTAT_TTL_DEFAULT = 5.0
 
+_cache: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+
+# Bumped by clear_qstat_cache, so a qstat started before the clear is not stored after it
+_cache_generation = 0
+_cache_lock = threading.Lock()
+
+
+def get_qstat_ttl() -> float:
+    """Get the qstat cache time-to-live in seconds. Zero or less disables the cache."""
+    return float(os.environ.get(QSTAT_TTL_ENVIRON, QSTAT_TTL_DEFAULT))
+
+
+def clear_qstat_cache() -> None:
+    """Drop all cached qstat listings, so the next call runs qstat.
+
+    A listing still being fetched when this is called is returned to its caller, but not cached.
+    """
+    global _cache_generation
+
+    with _cache_lock:
+        _cache_generation += 1
+        _cache.clear()
+
+
+def _ttl_cached(
+    key: str,
+) -> Callable[[Callable[[], list[dict[str, Any]]]], Callable[..., list[dict[str, Any]]]]:
+    """Reuse the result of a qstat listing, cached as `key`, within the TTL, unless
+    `force_refresh` is set.
+
+    Every call returns a fresh copy of the job rows.
+    """
+
+    def decorator(
+        func: Callable[[], list[dict[str, Any]]],
+    ) -> Callable[..., list[dict[str, Any]]]:
+        # Concurrent pollers wait for the one running qstat, and then share its result
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(force_refresh: bool = False) -> list[dict[str, Any]]:
+            ttl = get_qstat_ttl()
+
+            with lock:
+                now = time.monotonic()
+
+                cached = _cache.get(key)
+                if not force_refresh and ttl > 0 and cached is not None and now - cached[0] < ttl:
+                    logger.debug(f"Using cached {key}")
+                    jobs = cached[1]
+                else:
+                    generation = _cache_generation
+                    jobs = func()
+
+                    with _cache_lock:
+                        if generation == _cache_generation:
+                            _cache[key] = (now, jobs)
+
+            # Callers own their result, so changes to it do not leak into the cache
+            return [dict(row) for row in jobs]
+
+        return wrapper
+
+    return decorator
+
+
+@_ttl_cached("all_jobs_json")
 def get_all_jobs_json() -> list[dict[str, Any]]:
-    """Get all jobs for all users (JSON format)."""
-    all_users = '"*"'
+    """Get all jobs for all users (JSON format).
+
+    The result is reused for `HPC_FUNCS_QSTAT_TTL` seconds (default 5). Call with
+    `force_refresh=True` to bypass.
+    """
+    all_users = "*"
     jobs = get_qstat_json(users=[all_users])
     return jobs
 
 
+@_ttl_cached("all_jobs_text")
 def get_all_jobs_text() -> list[dict[str, Any]]:
-    """Get all jobs for all users (text format)."""
-    all_users = '"*"'
+    """Get all jobs for all users (text format).
+
+    The result is reused for `HPC_FUNCS_QSTAT_TTL` seconds (default 5). Call with
+    `force_refresh=True` to bypass.
+    """
+    all_users = "*"
     jobs = get_qstat_text(users=[all_users])
     return jobs
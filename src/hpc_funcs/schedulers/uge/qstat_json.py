@@ -1,12 +1,23 @@
 import json
 import logging
 import subprocess
+from collections.abc import Sequence
 from typing import Any
 
 from hpc_funcs.shell import execute
 
+from .qstat_text import split_error_lines
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# orjson is optional, and a lot faster on large qstat dumps. Its JSONDecodeError subclasses json's.
+_loads = json.loads if orjson is None else orjson.loads
+
 
 def get_qstat_job_json(
     job_id: str | int,
@@ -37,15 +48,39 @@ def get_qstat_job_json(
         ...     print(f"Job errors: {errors}")
     """
 
-    cmd = f"qstat -j {job_id} -nenv -json"
+    return get_qstat_jobs_json([job_id])
+
 
-    logger.debug(f"Executing: {cmd}")
+def get_qstat_jobs_json(
+    job_ids: Sequence[str | int],
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Get detailed information for several jobs with a single qstat -j call.
+
+    Args:
+        job_ids: The job IDs to query.
+
+    Returns:
+        Tuple of (job_info_list, error_list), as `get_qstat_job_json`, with one job info dict
+        per job found.
+
+    Raises:
+        json.JSONDecodeError: If the JSON output from qstat is malformed.
+
+    Examples:
+        >>> job_infos, errors = get_qstat_jobs_json([12345, 12346])
+    """
+
+    if not job_ids:
+        return [], []
+
+    cmd = ["qstat", "-j", ",".join(str(job_id) for job_id in job_ids), "-nenv", "-json"]
+
+    logger.debug(f"Executing: {' '.join(cmd)}")
 
     process = subprocess.run(
         cmd,
         encoding="utf-8",
         capture_output=True,
-        shell=True,
     )
 
     stdout = process.stdout
@@ -86,22 +121,20 @@ def get_qstat_json(
         >>> jobs = get_qstat_json(queues=["gpu.q", "default.q"])
     """
 
-    cmd = "qstat -json"
+    cmd = ["qstat", "-json"]
 
     if users is not None and len(users):
-        user_list = ",".join(users)
-        cmd += f" -u {user_list}"
+        cmd += ["-u", ",".join(users)]
 
     if queues:
-        queue_list = ",".join(queues)
-        cmd += f" -q {queue_list}"
+        cmd += ["-q", ",".join(queues)]
 
     if resource_filter:
-        cmd += f" -l {resource_filter}"
+        cmd += ["-l", resource_filter]
 
     # Execute command
-    logger.debug(f"Executing: {cmd}")
-    stdout, stderr = execute(cmd)
+    logger.debug(f"Executing: {' '.join(cmd)}")
+    stdout, stderr = execute(cmd, shell=False)
 
     if stderr:
         logger.warning(f"qstat stderr: {stderr}")
@@ -129,27 +162,15 @@ def parse_jobinfo_json(stdout: str) -> tuple[list[dict[str, Any]], list[str]]:
 
     KEY = "job_info"
 
-    stdout_lines: list[str] = []
-    errors: list[str] = []
-
     # Separate error lines from JSON content
-    for line in stdout.splitlines():
-        if line.startswith("error reason"):
-            errors.append(line)
-        else:
-            stdout_lines.append(line)
-
-    stdout = "\n".join(stdout_lines)
+    stdout, errors = split_error_lines(stdout)
 
     if not stdout.strip():
         return [], errors
 
-    data = json.loads(stdout)
-
-    if KEY not in data:
-        return [], errors
+    data = _loads(stdout)
 
-    rows = data[KEY]
+    rows = data.get(KEY, [])
 
     return rows, errors
 
@@ -162,29 +183,36 @@ def parse_joblist_json(stdout: str) -> list[dict[str, str]]:
 
     Returns:
         List of dicts, one per job/task, with job properties.
+
+    Raises:
+        json.JSONDecodeError: If the output is not valid JSON.
     """
 
-    data = json.loads(stdout)
+    # A JSON object without any job sections has nothing to decode, e.g. only the queue headers.
+    # Anything else is left to the decoder, so output that is not JSON still raises
+    if (
+        stdout.lstrip().startswith("{")
+        and '"running jobs"' not in stdout
+        and '"pending jobs"' not in stdout
+    ):
+        logger.debug("No jobs found in qstat output")
+        return []
 
-    rows = []
+    data = _loads(stdout)
 
     # Parse running jobs from queue_info
-    if "queue_info" in data:
-        for queue_section in data["queue_info"]:
-            if "running jobs" not in queue_section:
-                continue
-            for job in queue_section["running jobs"]:
-                row = _extract_job_row(job, job_type="running")
-                rows.append(row)
+    rows = [
+        _extract_job_row(job, job_type="running")
+        for queue_section in data.get("queue_info", ())
+        for job in queue_section.get("running jobs", ())
+    ]
 
     # Parse pending jobs from job_info
-    if "job_info" in data:
-        for job_section in data["job_info"]:
-            if "pending jobs" not in job_section:
-                continue
-            for job in job_section["pending jobs"]:
-                row = _extract_job_row(job, job_type="pending")
-                rows.append(row)
+    rows += [
+        _extract_job_row(job, job_type="pending")
+        for job_section in data.get("job_info", ())
+        for job in job_section.get("pending jobs", ())
+    ]
 
     if not rows:
         logger.debug("No jobs found in qstat output")
@@ -1,8 +1,13 @@
+import itertools
 import logging
 import re
 import subprocess
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
 from typing import Any
 
+from hpc_funcs.shell import stream
+
 from .constants import TAGS_ERROR, TAGS_PENDING, TAGS_RUNNING
 
 logger = logging.getLogger(__name__)
@@ -38,6 +43,9 @@ COLUMN_RUNNING = "running"
 COLUMN_PENDING = "pending"
 COLUMN_ERROR = "error"
 
+# Task-array range, "start-stop:step", e.g. "1-100:1", or a single task "1"
+TASK_RANGE_RE = re.compile(r"^(\d+)(?:-(\d+))?(?::(\d+))?", re.ASCII)
+
 # jobinfo columns
 COLUMN_INFO_JOBID = "job_number"
 COLUMN_INFO_USER = "owner"
@@ -70,37 +78,29 @@ def get_qstat_text(
         >>> jobs = get_qstat_text(queues=["gpu.q", "default.q"])
     """
 
-    cmd = "qstat"
+    cmd = ["qstat"]
 
     if users is not None and len(users):
-        user_list = ",".join(users)
-        cmd += f" -u {user_list}"
+        cmd += ["-u", ",".join(users)]
 
     if queues:
-        queue_list = ",".join(queues)
-        cmd += f" -q {queue_list}"
+        cmd += ["-q", ",".join(queues)]
 
     if resource_filter:
-        cmd += f" -l {resource_filter}"
+        cmd += ["-l", resource_filter]
 
-    # Execute command
-    logger.debug(f"Executing: {cmd}")
-    process = subprocess.run(
-        cmd,
-        encoding="utf-8",
-        capture_output=True,
-        shell=True,
-    )
+    # Execute command, and parse the lines as qstat writes them
+    logger.debug(f"Executing: {' '.join(cmd)}")
+    result = stream(cmd, shell=False)
 
-    stdout = process.stdout
-    stderr = process.stderr
+    jobs = parse_joblist_text(result)
+
+    stderr = result.stderr
+    result.wait()
 
     if stderr:
         logger.warning(f"qstat stderr: {stderr}")
 
-    # Parse and return list of dicts
-    jobs = parse_joblist_text(stdout)
-
     return jobs
 
 
@@ -130,15 +130,36 @@ def get_qstat_job_text(
         ...     print(f"Errors: {errors}")
     """
 
-    cmd = f"qstat -j {job_id} -nenv"
+    return get_qstat_jobs_text([job_id])
+
 
-    logger.debug(f"Executing: {cmd}")
+def get_qstat_jobs_text(
+    job_ids: Sequence[str | int],
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Get detailed information for several jobs with a single qstat -j call (text format).
+
+    Args:
+        job_ids: The job IDs to query.
+
+    Returns:
+        Tuple of (job_info_list, error_list), as `get_qstat_job_text`, with one job info dict
+        per job found.
+
+    Examples:
+        >>> jobs, errors = get_qstat_jobs_text([12345, 12346])
+    """
+
+    if not job_ids:
+        return [], []
+
+    cmd = ["qstat", "-j", ",".join(str(job_id) for job_id in job_ids), "-nenv"]
+
+    logger.debug(f"Executing: {' '.join(cmd)}")
 
     process = subprocess.run(
         cmd,
         encoding="utf-8",
         capture_output=True,
-        shell=True,
     )
 
     stdout = process.stdout
@@ -148,44 +169,64 @@ def get_qstat_job_text(
         logger.warning(f"qstat stderr: {stderr}")
 
     # Separate error lines from content
-    lines = stdout.splitlines()
-    text_lines: list[str] = []
+    stdout, errors = split_error_lines(stdout)
+
+    # Parse the text output, sections are split by "=" lines
+    jobs = parse_jobinfo_text(stdout)
+
+    return jobs, errors
+
+
+def split_error_lines(stdout: str) -> tuple[str, list[str]]:
+    """Separate the "error reason" lines of qstat -j output from the content.
+
+    Args:
+        stdout: Output from qstat -j, in any format
+
+    Returns:
+        Tuple of (content without error lines, error lines)
+    """
+
+    # Most output has no errors, so only rebuild the content if there are any
+    if "error reason" not in stdout:
+        return stdout, []
+
+    lines: list[str] = []
     errors: list[str] = []
 
-    for line in lines:
+    for line in stdout.splitlines():
         if line.startswith("error reason"):
             errors.append(line)
         else:
-            text_lines.append(line)
-
-    stdout = "\n".join(text_lines)
+            lines.append(line)
 
-    # Parse the text output
-    jobs = parse_jobinfo_text(stdout)
-
-    return jobs, errors
+    return "\n".join(lines), errors
 
 
-def parse_joblist_text(stdout: str) -> list[dict[str, Any]]:
+def parse_joblist_text(stdout: str | Iterable[str]) -> list[dict[str, Any]]:
     """
     Parse UGE qstat text output (list format).
 
     Args:
-        stdout: String output from qstat command
+        stdout: String output from qstat command, or its lines, e.g. streamed from the process
 
     Returns:
         List of dictionaries containing job information
     """
     jobs: list[dict[str, Any]] = []
-    lines = stdout.strip().split("\n")
-
-    if len(lines) < 3:
-        return []
+    lines = iter(stdout.strip().splitlines() if isinstance(stdout, str) else stdout)
 
     # First line is the header with column names
-    header_line = lines[0]
+    header_line = next((line for line in lines if line.strip()), "")
+
     # Second line is the separator (dashes)
-    # Data starts from third line
+    next(lines, None)
+
+    # Data starts from third line. Without any, e.g. a one-line error message, there are no jobs
+    first_line = next((line for line in lines if line.strip()), None)
+
+    if first_line is None:
+        return []
 
     # Parse the header to find column positions
     # use the header line to identify where each column starts
@@ -200,21 +241,18 @@ def parse_joblist_text(stdout: str) -> list[dict[str, Any]]:
     # Ensure columns are processed in left-to-right order in the header
     ordered_cols = sorted(COLUMNS_TEXT, key=lambda c: column_positions[c])
 
+    # The layout is the same for every line, so resolve (column, start, end) once
+    starts = [column_positions[col] for col in ordered_cols]
+    ends: list[int | None] = [*starts[1:], None]
+    slices = tuple(zip(ordered_cols, starts, ends, strict=True))
+
     # Process each data line
-    for line in lines[2:]:
+    for line in itertools.chain((first_line,), lines):
         if not line.strip():
             continue
 
         # Extract fields based on column positions
-        # We'll use the positions to slice the line
-        job: dict[str, Any] = {}
-
-        for i, col in enumerate(ordered_cols):
-            start = column_positions[col]
-            end = column_positions[ordered_cols[i + 1]] if i + 1 < len(ordered_cols) else None
-            value = line[start:end].strip()
-
-            job[col] = value
+        job: dict[str, Any] = {col: line[start:end].strip() for col, start, end in slices}
 
         jobs.append(job)
 
@@ -228,31 +266,26 @@ def parse_jobinfo_text(stdout: str) -> list[dict[str, str]]:
     """
 
     COL_VALUE_START = 28
+    SEPARATOR = "=" * 5
 
     output: list[dict[str, str]] = [{}]
 
-    lines = stdout.split("\n")
-
-    for line in lines:
-        if "=" * 5 in line:
+    for line in stdout.splitlines():
+        if line.startswith(SEPARATOR):
             if len(output[-1]) > 1:
                 output += [{}]
             continue
 
         # Format: pe_taskid     NONE
         key = line[:COL_VALUE_START].strip()
-        value = line[COL_VALUE_START:].strip()
 
         if key.endswith(":"):
-            key = key[:-1]
+            key = key[:-1].rstrip()
 
         if len(key) == 0:
             continue
 
-        key = key.strip()
-        value = value.strip()
-
-        output[-1][key] = value
+        output[-1][key] = line[COL_VALUE_START:].strip()
 
     return output
 
@@ -272,23 +305,16 @@ def parse_qstat_text(stdout: str) -> list[dict[str, Any]]:
         idx = lines[0].index(line)
         header_indicies.append(idx)
 
-    def split_qstat_line(line):
-        idx = 0
-
-        for ind in header_indicies:
-            yield line[idx:ind].strip()
-            idx = ind
-
-        yield line[idx:]
+    # Fixed-width columns, so resolve (column, start, end) once for all lines
+    starts = [0, *header_indicies]
+    ends: list[int | None] = [*header_indicies, None]
+    slices = tuple(zip(header, starts, ends, strict=True))
 
     for line in lines[2:]:
         if not line.strip():
             continue
 
-        line_ = split_qstat_line(line)
-        line_ = list(line_)
-
-        row: dict[str, Any] = dict(zip(header, line_, strict=False))
+        row: dict[str, Any] = {col: line[start:end].strip() for col, start, end in slices}
         # Convert slots to int
         if "slots" in row:
             row["slots"] = int(row["slots"])
@@ -297,6 +323,29 @@ def parse_qstat_text(stdout: str) -> list[dict[str, Any]]:
     return rows
 
 
+@lru_cache(maxsize=1024)
+def _parse_task_count(line: str) -> int:
+    """Parse task array string like '1-100:1' into task count.
+
+    Cached, as the same few range strings repeat across the lines of a job list.
+    """
+    count = 0
+
+    parts = line.split(",")
+    for task in parts:
+        if "-" not in task:
+            count += 1
+            continue
+
+        match = TASK_RANGE_RE.fullmatch(task)
+        if match is None:
+            raise ValueError(f"Could not parse task range: {task}")
+
+        count += int(match.group(2)) - int(match.group(1))
+
+    return count
+
+
 def parse_taskarray(jobs: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Parse task array information from job list.
 
@@ -307,47 +356,40 @@ def parse_taskarray(jobs: list[dict[str, Any]]) -> list[dict[str, Any]]:
         List of dicts with job_id, running, pending, error counts
     """
 
-    def _parse_task_count(line: str) -> int:
-        """Parse task array string like '1-100:1' into task count."""
-        count = 0
+    # Count tasks per job id in a single pass over the jobs
+    counts: dict[str, dict[str, Any]] = {}
 
-        parts = line.split(",")
-        for task in parts:
-            if "-" not in task:
-                count += 1
-                continue
+    for job in jobs:
+        job_id = job[COLUMN_JOBID]
 
-            start, stop, _ = re.split(r",|:|-|!", task)
-            count += int(stop) - int(start)
+        row = counts.get(job_id)
+        if row is None:
+            row = counts[job_id] = {
+                COLUMN_JOBID: job_id,
+                COLUMN_RUNNING: 0,
+                COLUMN_PENDING: 0,
+                COLUMN_ERROR: 0,
+            }
 
-        return count
+        state = job.get(COLUMN_STATE)
 
-    # Get unique job IDs
-    job_ids = {job[COLUMN_JOBID] for job in jobs}
+        if state in TAGS_PENDING:
+            row[COLUMN_PENDING] += _parse_task_count(job.get(COLUMN_ARRAY, ""))
+        elif state in TAGS_RUNNING:
+            row[COLUMN_RUNNING] += 1
+        elif state in TAGS_ERROR:
+            row[COLUMN_ERROR] += _parse_task_count(job.get(COLUMN_ARRAY, ""))
 
-    rows: list[dict[str, Any]] = []
-
-    for job_id in job_ids:
-        # Filter jobs by job_id
-        job_subset = [j for j in jobs if j[COLUMN_JOBID] == job_id]
-
-        # Filter by state
-        pending_jobs = [j for j in job_subset if j.get(COLUMN_STATE) in TAGS_PENDING]
-        running_jobs = [j for j in job_subset if j.get(COLUMN_STATE) in TAGS_RUNNING]
-        error_jobs = [j for j in job_subset if j.get(COLUMN_STATE) in TAGS_ERROR]
+    return list(counts.values())
 
-        # Count tasks
-        n_pending = sum(_parse_task_count(j.get(COLUMN_ARRAY, "")) for j in pending_jobs)
-        n_running = len(running_jobs)
-        n_error = sum(_parse_task_count(j.get(COLUMN_ARRAY, "")) for j in error_jobs)
 
-        row = {
-            COLUMN_JOBID: job_id,
-            COLUMN_RUNNING: n_running,
-            COLUMN_PENDING: n_pending,
-            COLUMN_ERROR: n_error,
-        }
+def index_taskarray(jobs: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Task array counts by job id, as `parse_taskarray`, for O(1) lookup per job.
 
-        rows.append(row)
+    Args:
+        jobs: List of job dicts from get_qstat_text or parse_joblist_text
 
-    return rows
+    Returns:
+        Dict of job_id to dict with job_id, running, pending, error counts
+    """
+    return {row[COLUMN_JOBID]: row for row in parse_taskarray(jobs)}
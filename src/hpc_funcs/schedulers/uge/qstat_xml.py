@@ -1,7 +1,9 @@
+import io
 import logging
 import subprocess
 import xml.etree.ElementTree as ET
-from typing import Any
+from collections.abc import Sequence
+from typing import IO, Any
 from xml.etree.ElementTree import Element
 
 logger = logging.getLogger(__name__)
@@ -33,15 +35,35 @@ def get_qstat_job_xml(
         ...     print(job["JB_owner"])
     """
 
-    cmd = f"qstat -j {job_id} -nenv -xml"
+    return get_qstat_jobs_xml([job_id])
 
-    logger.debug(f"Executing: {cmd}")
+
+def get_qstat_jobs_xml(
+    job_ids: Sequence[str | int],
+) -> list[dict[str, Any]]:
+    """Get detailed information for several jobs with a single qstat -j -xml call.
+
+    Args:
+        job_ids: The job IDs to query.
+
+    Returns:
+        List of dictionaries with detailed job information, one per job found.
+
+    Examples:
+        >>> jobs = get_qstat_jobs_xml([12345, 12346])
+    """
+
+    if not job_ids:
+        return []
+
+    cmd = ["qstat", "-j", ",".join(str(job_id) for job_id in job_ids), "-nenv", "-xml"]
+
+    logger.debug(f"Executing: {' '.join(cmd)}")
 
     process = subprocess.run(
         cmd,
         encoding="utf-8",
         capture_output=True,
-        shell=True,
     )
 
     stdout = process.stdout
@@ -60,7 +82,7 @@ def get_qstat_job_xml(
 
 
 def parse_jobinfo_xml(
-    stdout_xml: str,
+    stdout_xml: str | IO[str],
 ) -> list[
     dict[
         str,
@@ -78,7 +100,7 @@ def parse_jobinfo_xml(
     from the djob_info elements.
 
     Args:
-        stdout_xml: Raw XML string from qstat -j -xml command.
+        stdout_xml: Raw XML string from qstat -j -xml command, or a file object to stream it from.
 
     Returns:
         List of dictionaries, each containing detailed job information.
@@ -96,19 +118,31 @@ def parse_jobinfo_xml(
 
     """
 
-    root = ET.fromstring(stdout_xml)
-
     jobs: list[dict[str, Any]] = []
 
-    # Find all djob_info/element nodes
-    for element in root.findall(".//djob_info/element"):
+    # Stream the document, and parse each djob_info/element as soon as it is complete, so only
+    # one job is held as a tree at a time
+    parents: list[str] = []
+
+    source = io.StringIO(stdout_xml) if isinstance(stdout_xml, str) else stdout_xml
+
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            parents.append(element.tag)
+            continue
+
+        parents.pop()
+
+        if element.tag != "element" or not parents or parents[-1] != "djob_info":
+            continue
+
         d = parse_element(element)
 
         if not isinstance(d, dict):
             raise RuntimeError(f"Expected dict from parse_element, got {type(d)}")
 
         jobs.append(d)
-        print(d)
+        element.clear()
 
     return jobs
 
@@ -124,8 +158,8 @@ def parse_element(elem: Element) -> Any:
     if not has_children:
         return text
 
-    child_tags = [child.tag for child in elem]
-    if "element" in child_tags:
+    # Find the first <element> child in C, without building a list of child tags
+    if elem.find("element") is not None:
         return element_to_list(elem)
 
     return element_to_dict(elem)
@@ -141,15 +175,22 @@ def element_to_dict(
     | dict[str, dict[str, str]]
     | dict[str, str],
 ]:
-    children = list(elem)
-    child_map: dict[str, list[Any]] = {}
-    for child in children:
+    d: dict[str, Any] = {}
+
+    # Tags are mostly unique, so only collect values into a list once a tag repeats
+    repeated: set[str] = set()
+
+    for child in elem:
         child_val = parse_element(child)
-        child_map.setdefault(child.tag, []).append(child_val)
+        tag = child.tag
 
-    d: dict[str, Any] = {}
-    for tag, items in child_map.items():
-        d[tag] = items[0] if len(items) == 1 else items
+        if tag not in d:
+            d[tag] = child_val
+        elif tag in repeated:
+            d[tag].append(child_val)
+        else:
+            d[tag] = [d[tag], child_val]
+            repeated.add(tag)
 
     return d
 
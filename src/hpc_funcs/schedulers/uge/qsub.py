@@ -1,13 +1,19 @@
 import logging
+import re
 import subprocess
 from pathlib import Path
 
 from hpc_funcs.files import generate_name
 
+from .qstat import clear_qstat_cache
+
 logger = logging.getLogger(__name__)
 
 # TODO Support for sync -y
 
+# qsub -terse job id, like 12345 or, for task arrays, 12345.1-10:1
+_QSUB_JOB_ID_RE = re.compile(r"^(\d+)(?:\.\S*)?$", re.ASCII | re.MULTILINE)
+
 
 def write_script(
     content: str,
@@ -39,8 +45,7 @@ def write_script(
 
     script_path = directory / filename
 
-    with open(script_path, "w") as f:
-        f.write(content)
+    script_path.write_text(content, encoding="utf-8", newline="\n")
 
     logger.debug(f"Wrote script to {script_path}")
 
@@ -65,8 +70,8 @@ def submit_script(script_path: Path | str) -> str:
     if not script_path.exists():
         raise FileNotFoundError(f"Script not found: {script_path}")
 
-    cmd = f"qsub -terse {script_path.name}"
-    logger.debug(f"Running: {cmd} in {script_path.parent}")
+    cmd = ["qsub", "-terse", script_path.name]
+    logger.debug(f"Running: {' '.join(cmd)} in {script_path.parent}")
 
     try:
         process = subprocess.run(
@@ -74,7 +79,6 @@ def submit_script(script_path: Path | str) -> str:
             cwd=script_path.parent,
             encoding="utf-8",
             capture_output=True,
-            shell=True,
             check=True,
         )
     except subprocess.CalledProcessError as e:
@@ -82,19 +86,21 @@ def submit_script(script_path: Path | str) -> str:
         logger.error(f"qsub stderr: {e.stderr.strip()}")
         raise RuntimeError(f"Failed to submit job with qsub: {e.stderr.strip()}") from e
 
-    uge_id = process.stdout.strip()
+    stdout = process.stdout.strip()
 
-    if not uge_id:
+    if not stdout:
         raise RuntimeError("qsub returned no output - unable to get job ID")
 
-    # task arrray job IDs can be like 12345 or 12345.1-10:1, we just want the main part
-    uge_id = uge_id.split(".")[0]
+    # Take the main part of the last job id line, ignoring any other scheduler output
+    matches = _QSUB_JOB_ID_RE.findall(stdout)
 
-    # Validate format of job_id
-    try:
-        int(uge_id)
-    except ValueError as err:
-        raise RuntimeError(f"UGE Job ID is not a valid number: '{uge_id}'") from err
+    if not matches:
+        raise RuntimeError(f"UGE Job ID is not a valid number: '{stdout.splitlines()[-1]}'")
+
+    uge_id = matches[-1]
+
+    # A listing cached before this submission does not know the job, and would report it done
+    clear_qstat_cache()
 
     logger.info(f"Submitted job: {uge_id}")
 
@@ -1,5 +1,9 @@
 import logging
+import os
+import re
 from collections import defaultdict
+from collections.abc import Iterable, Iterator, Mapping
+from functools import lru_cache
 from pathlib import Path
 
 from jinja2 import Template
@@ -13,6 +17,9 @@ LMOD_LINES = [
     "=>",
 ]
 
+# All LMOD_LINES in one pattern, so each line is scanned once
+_LMOD_RE = re.compile("|".join(re.escape(lmod_line) for lmod_line in LMOD_LINES))
+
 
 def generate_script(
     cmd: str,
@@ -135,24 +142,27 @@ def generate_script(
         "module_load": module_load if module_load is not None else [],
     }
 
-    with open(MASTER_TEMPLATE, encoding="utf-8") as file_:
-        template = Template(file_.read())
-
-    script = template.render(context)
+    script = _get_template().render(context)
 
     return script
 
 
+@lru_cache
+def _get_template() -> Template:
+    """Read and compile the master template once per process"""
+    return Template(MASTER_TEMPLATE.read_text(encoding="utf-8"))
+
+
 def generate_log_dir(log_dir: Path | None) -> str | None:
     if log_dir is not None:
-        if not log_dir.exists():
-            log_dir.mkdir(parents=True)
+        try:
+            log_dir.mkdir(parents=True, exist_ok=True)
+        except FileExistsError:
+            # Exists, but is not a directory
+            return str(log_dir.resolve())
 
-        if log_dir.is_dir():
-            _log_dir = str(log_dir.resolve() / "_")[:-1]  # Added a trailing slash
-            return _log_dir
-
-        return str(log_dir.resolve())
+        _log_dir = str(log_dir.resolve() / "_")[:-1]  # Added a trailing slash
+        return _log_dir
 
     return None
 
@@ -165,37 +175,51 @@ def read_logfiles(
 ) -> tuple[dict[Path, list[str]], dict[Path, list[str]]]:
     """Read logfiles produced by UGE task array. Ignore empty log files"""
     logger.debug("Looking for finished log files in %s", log_path)
-    stderr_log_filenames = list(log_path.glob(f"*.e{job_id}*"))
 
-    stderr = {}
-    for filename in stderr_log_filenames:
-        if filename.stat().st_size == 0:
-            continue
-        stderr[filename] = parse_logfile(filename)
+    # Log files are named like <name>.e<job_id>.<task_id>, find both kinds in one directory pass
+    stderr_tag = f".e{job_id}"
+    stdout_tag = f".o{job_id}"
+
+    stderr_log_filenames: list[Path] = []
+    stdout_log_filenames: list[Path] = []
+
+    with os.scandir(log_path) as entries:
+        for entry in entries:
+            if stderr_tag in entry.name:
+                filenames = stderr_log_filenames
+            elif not ignore_stdout and stdout_tag in entry.name:
+                filenames = stdout_log_filenames
+            else:
+                continue
+
+            if not entry.is_file() or entry.stat().st_size == 0:
+                continue
+
+            filenames.append(log_path / entry.name)
 
     if filter_lmod:
-        stderr = filter_stderr_for_lmod(stderr)
+        # Filter the lines as they are read, without holding the unfiltered logs
+        stderr = filter_stderr_for_lmod(
+            {filename: parse_logfile_iter(filename) for filename in stderr_log_filenames}
+        )
+    else:
+        stderr = {filename: parse_logfile(filename) for filename in stderr_log_filenames}
 
     if ignore_stdout:
         return {}, stderr
 
-    stdout_log_filenames = log_path.glob(f"*.o{job_id}*")
-    stdout = {}
-    for filename in stdout_log_filenames:
-        if filename.stat().st_size == 0:
-            continue
-        stdout[filename] = parse_logfile(filename)
+    stdout = {filename: parse_logfile(filename) for filename in stdout_log_filenames}
 
     return stdout, stderr
 
 
-def filter_stderr_for_lmod(stderr_dict: dict[Path, list[str]]) -> dict[Path, list[str]]:
+def filter_stderr_for_lmod(stderr_dict: Mapping[Path, Iterable[str]]) -> dict[Path, list[str]]:
     """Filter stderr for lmod lines"""
 
     stderr_filtered = defaultdict(list)
     for filename, lines in stderr_dict.items():
         for line in lines:
-            if len(line) == 0 or any(lmod_line in line for lmod_line in LMOD_LINES):
+            if len(line) == 0 or _LMOD_RE.search(line):
                 continue
             stderr_filtered[filename].append(line)
 
@@ -204,7 +228,12 @@ def filter_stderr_for_lmod(stderr_dict: dict[Path, list[str]]) -> dict[Path, lis
 
 def parse_logfile(filename: Path) -> list[str]:
     """Read logfile, without line-breaks"""
+    return list(parse_logfile_iter(filename))
+
+
+def parse_logfile_iter(filename: Path) -> Iterator[str]:
+    """Read logfile line by line, without line-breaks"""
     # TODO Maybe find exceptions and raise them?
     with open(filename, encoding="utf-8") as f:
-        lines = f.read().split("\n")
-    return lines
+        for line in f:
+            yield line.rstrip("\n")
@@ -1,7 +1,9 @@
+import contextlib
 import logging
 import os
 import shutil
 import subprocess
+import threading
 import time
 from collections.abc import Iterator
 from pathlib import Path
@@ -9,6 +11,8 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+STREAM_BUFSIZE = 1 << 16
+
 
 def which(cmd: Path | str) -> Path | None:
     """Check if command exists in environment"""
@@ -62,15 +66,30 @@ class StreamResult:
         self._stderr: str | None = None
         self._exhausted = False
 
+        # Drain stderr in the background, so a chatty stderr cannot fill its pipe and block the
+        # process while stdout is being read
+        self._stderr_thread: threading.Thread | None = None
+        if process.stderr is not None:
+            self._stderr_thread = threading.Thread(target=self._read_stderr, daemon=True)
+            self._stderr_thread.start()
+
+    def _read_stderr(self) -> None:
+        if self._process.stderr is None:
+            return
+
+        # Stream can be closed by close()
+        with contextlib.suppress(OSError, ValueError):
+            self._stderr = self._process.stderr.read()
+
     def __iter__(self) -> Iterator[str]:
         if self._process.stdout is None:
             return
 
         yield from iter(self._process.stdout.readline, "")
 
-        # Capture stderr after stdout is exhausted
-        if self._process.stderr is not None:
-            self._stderr = self._process.stderr.read()
+        # stderr is complete once the process has closed it
+        if self._stderr_thread is not None:
+            self._stderr_thread.join()
 
         self._process.stdout.close()
         self._exhausted = True
@@ -90,22 +109,33 @@ class StreamResult:
 
     def close(self) -> None:
         """Close the process streams and terminate if still running."""
+        self._process.terminate()
         if self._process.stdout:
             self._process.stdout.close()
+        if self._stderr_thread is not None:
+            self._stderr_thread.join(timeout=1)
+            if self._stderr_thread.is_alive():
+                # Still held open by a child, the reader thread ends at EOF
+                return
         if self._process.stderr:
             self._process.stderr.close()
-        self._process.terminate()
 
 
-def stream(cmd: str, cwd: Path | None = None, shell: bool = True) -> StreamResult:
+def stream(
+    cmd: str | list[str],
+    cwd: Path | None = None,
+    shell: bool = True,
+    encoding: str = "utf-8",
+) -> StreamResult:
     """Execute command in directory, and stream stdout.
 
     Returns a StreamResult object that can be iterated to get stdout lines.
     After iteration, stderr is available via the `.stderr` property.
 
-    :param cmd: The shell command
+    :param cmd: The shell command, or argv list when shell is False
     :param cwd: Change directory to work directory
     :param shell: Use shell or not in subprocess
+    :param encoding: Encoding of the stdout and stderr text, independent of the locale
     :returns: StreamResult object for streaming stdout and accessing stderr.
 
     Example:
@@ -119,11 +149,13 @@ def stream(cmd: str, cwd: Path | None = None, shell: bool = True) -> StreamResul
     if not switch_workdir(cwd):
         cwd = None
 
+    # 64 KiB read buffer on the Python side of the pipes, so large outputs are read in few syscalls
     popen = subprocess.Popen(
         cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        universal_newlines=True,
+        encoding=encoding,
+        bufsize=STREAM_BUFSIZE,
         shell=shell,
         cwd=cwd,
     )
@@ -132,7 +164,7 @@ def stream(cmd: str, cwd: Path | None = None, shell: bool = True) -> StreamResul
 
 
 def execute(
-    cmd: str,
+    cmd: str | list[str],
     cwd: Path | None = None,
     shell: bool = True,
     timeout: None = None,
@@ -140,7 +172,7 @@ def execute(
 ) -> tuple[str, str]:
     """Execute command in directory, and return stdout and stderr
 
-    :param cmd: The shell command
+    :param cmd: The shell command, or argv list when shell is False
     :param cwd: Change directory to work directory
     :param shell: Use shell or not in subprocess
     :param timeout: Stop the process at timeout (seconds)
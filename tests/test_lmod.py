@@ -54,6 +54,15 @@ def test_load_os() -> None:
     # assert MODULE_NAME in list(modules_loaded.values())
 
 
+def test_load_many() -> None:
+    lmod.use(MODULE_PATH)
+
+    lmod.load_many([MODULE_NAME])
+
+    # Check env is set
+    assert os.environ.get("TESTLMODMODULE") == "THIS IS A TEST"
+
+
 def test_load_return() -> None:
     lmod.use(MODULE_PATH)
 
@@ -1,4 +1,5 @@
 import subprocess
+import sys
 
 import pytest
 
@@ -15,3 +16,13 @@ def test_subprocess_error_retry():
     command_fails = "this_command_does_not_exist"
     with pytest.raises(subprocess.CalledProcessError):
         shell.execute_with_retry(command_fails, max_retries=0)
+
+
+def test_stream_large_stderr():
+    # More stderr than a pipe holds, written before any stdout
+    code = "import sys; sys.stderr.write('e' * 300000); print('done')"
+    result = shell.stream([sys.executable, "-c", code], shell=False)
+    lines = list(result)
+    assert lines == ["done\n"]
+    assert len(result.stderr) == 300000
+    assert result.wait() == 0
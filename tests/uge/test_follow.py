@@ -0,0 +1,115 @@
+import datetime
+import io
+import time
+
+import pytest
+from conftest import RESOURCES  # type: ignore
+
+from hpc_funcs.schedulers.uge.monitoring import follow
+from hpc_funcs.schedulers.uge.monitoring.follow import (
+    DATE_FORMAT,
+    FollowGroup,
+    PollSchedule,
+    TaskarrayProgress,
+    get_time_from_ugestr,
+)
+from hpc_funcs.schedulers.uge.qstat_text import (
+    COLUMN_ARRAY,
+    COLUMN_ERROR,
+    COLUMN_JOBID,
+    COLUMN_PENDING,
+    COLUMN_RUNNING,
+    COLUMN_STATE,
+    parse_jobinfo_text,
+)
+
+
+def _get_progress(buf: io.StringIO) -> TaskarrayProgress:
+    filename = RESOURCES / "uge" / "qstat_jobinfo_array.txt"
+
+    with open(filename) as f:
+        stdout = f.read()
+
+    job_info = parse_jobinfo_text(stdout)[0]
+
+    return TaskarrayProgress(job_info, file=buf)
+
+
+def test_update_from_index():
+    buf = io.StringIO()
+    progress_bar = _get_progress(buf)
+
+    assert progress_bar.job_id == "30017751"
+    assert progress_bar.n_total == 2
+
+    row = {COLUMN_JOBID: "30017751", COLUMN_RUNNING: 1, COLUMN_PENDING: 1, COLUMN_ERROR: 0}
+
+    # Same result from the row list and from the job id index
+    progress_bar.update(joblist=[row])
+    assert progress_bar.pbar.n == 0
+
+    meter = buf.getvalue()
+    progress_bar.update(joblist={"30017751": row})
+    assert progress_bar.pbar.n == 0
+
+    # Unchanged state is not redrawn
+    assert buf.getvalue() == meter
+    assert not progress_bar.is_finished()
+
+    # Job no longer in qstat means it is done
+    group = FollowGroup([progress_bar])
+    for bar in group.bars:
+        bar.update(joblist={})
+
+    assert group.is_finished()
+    assert "100%" in buf.getvalue()
+
+    group.close()
+
+
+def test_group_poll_and_run(monkeypatch: pytest.MonkeyPatch):
+    buf = io.StringIO()
+    progress_bar = _get_progress(buf)
+
+    running = {COLUMN_JOBID: "30017751", COLUMN_STATE: "r", COLUMN_ARRAY: "1"}
+    pending = {COLUMN_JOBID: "30017751", COLUMN_STATE: "qw", COLUMN_ARRAY: "2"}
+
+    # qstat listings as seen by consecutive polls, until the job is gone
+    listings = iter([[running, pending]] * 4 + [[running], []])
+    monkeypatch.setattr(follow, "get_all_jobs_text", lambda: next(listings))
+
+    sleeps: list[float] = []
+    monkeypatch.setattr(follow.time, "sleep", sleeps.append)
+
+    group = FollowGroup([progress_bar], schedule=PollSchedule(minimum=2, maximum=10))
+
+    # First poll is a change, the same listing again is not
+    assert group.poll()
+    assert not group.poll()
+    assert not group.is_finished()
+
+    # Backs off while unchanged, resets on change, and stops once the job is gone
+    group.run()
+
+    assert group.is_finished()
+    assert sleeps == [4, 8, 2]
+    assert next(listings, None) is None
+
+    group.close()
+
+
+def test_poll_schedule():
+    schedule = PollSchedule(minimum=2, maximum=10)
+
+    assert schedule.next_interval(False) == 4
+    assert schedule.next_interval(False) == 8
+    assert schedule.next_interval(False) == 10
+    assert schedule.next_interval(True) == 2
+
+
+def test_time_from_ugestr():
+    time_str = "11/15/2025 16:02:55.363"
+
+    expected = datetime.datetime.strptime("11/15/2025 16:02:55", DATE_FORMAT)
+
+    assert get_time_from_ugestr(time_str) == time.mktime(expected.timetuple())
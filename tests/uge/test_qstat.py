@@ -39,7 +39,7 @@ def test_jobinfo_from_joblist_text():
     print(df)
     assert len(df) > 1
 
-    job_id = df[COLUMN_JOBID].values[0]
+    job_id = df[COLUMN_JOBID].iat[0]
 
     # Get specific job info
     job_infos, job_erros = get_qstat_job_text(job_id)
@@ -0,0 +1,96 @@
+from collections.abc import Generator
+
+import pytest
+
+from hpc_funcs.schedulers.uge import qstat
+
+
+@pytest.fixture
+def qstat_calls(monkeypatch: pytest.MonkeyPatch) -> Generator[list[str], None, None]:
+    """Count qstat listings, without calling UGE"""
+
+    calls: list[str] = []
+
+    def get_qstat_text(users=None):
+        calls.append("text")
+        return [{"job-ID": "1", "state": "r"}]
+
+    def get_qstat_json(users=None):
+        calls.append("json")
+        return [{"job_number": 1, "state": "r"}]
+
+    monkeypatch.setattr(qstat, "get_qstat_text", get_qstat_text)
+    monkeypatch.setattr(qstat, "get_qstat_json", get_qstat_json)
+    monkeypatch.delenv(qstat.QSTAT_TTL_ENVIRON, raising=False)
+
+    qstat.clear_qstat_cache()
+    yield calls
+    qstat.clear_qstat_cache()
+
+
+def test_cache_hit(qstat_calls: list[str]):
+    assert qstat.get_all_jobs_text() == qstat.get_all_jobs_text()
+    assert qstat.get_all_jobs_json() == qstat.get_all_jobs_json()
+    assert qstat_calls == ["text", "json"]
+
+
+def test_cache_copy(qstat_calls: list[str]):
+    jobs = qstat.get_all_jobs_text()
+    jobs.append({"job-ID": "2"})
+    jobs[0]["state"] = "qw"
+
+    assert qstat.get_all_jobs_text() == [{"job-ID": "1", "state": "r"}]
+    assert qstat_calls == ["text"]
+
+
+def test_cache_expiry(qstat_calls: list[str], monkeypatch: pytest.MonkeyPatch):
+    now = 1000.0
+    monkeypatch.setattr(qstat.time, "monotonic", lambda: now)
+
+    qstat.get_all_jobs_text()
+    now += qstat.QSTAT_TTL_DEFAULT - 1
+    qstat.get_all_jobs_text()
+    assert qstat_calls == ["text"]
+
+    now += 1
+    qstat.get_all_jobs_text()
+    assert qstat_calls == ["text", "text"]
+
+
+def test_cache_force_refresh(qstat_calls: list[str]):
+    qstat.get_all_jobs_text()
+    qstat.get_all_jobs_text(force_refresh=True)
+    assert qstat_calls == ["text", "text"]
+
+    # The refreshed listing is cached for the next call
+    qstat.get_all_jobs_text()
+    assert qstat_calls == ["text", "text"]
+
+
+@pytest.mark.parametrize("ttl", ["0", "-1"])
+def test_cache_disabled(qstat_calls: list[str], monkeypatch: pytest.MonkeyPatch, ttl: str):
+    monkeypatch.setenv(qstat.QSTAT_TTL_ENVIRON, ttl)
+
+    qstat.get_all_jobs_text()
+    qstat.get_all_jobs_text()
+    assert qstat_calls == ["text", "text"]
+
+
+def test_cache_clear_during_fetch(qstat_calls: list[str], monkeypatch: pytest.MonkeyPatch):
+    """A listing fetched across a clear, e.g. a qsub during the poll, is not cached"""
+
+    get_qstat_text = qstat.get_qstat_text
+
+    def get_qstat_text_clearing(users=None):
+        jobs = get_qstat_text(users=users)
+        qstat.clear_qstat_cache()
+        return jobs
+
+    monkeypatch.setattr(qstat, "get_qstat_text", get_qstat_text_clearing)
+    qstat.get_all_jobs_text()
+
+    monkeypatch.setattr(qstat, "get_qstat_text", get_qstat_text)
+    qstat.get_all_jobs_text()
+    qstat.get_all_jobs_text()
+
+    assert qstat_calls == ["text", "text"]
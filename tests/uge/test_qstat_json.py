@@ -1,5 +1,9 @@
+import json
+
+import pytest
 from conftest import RESOURCES  # type: ignore
 
+from hpc_funcs.schedulers.uge import qstat_json
 from hpc_funcs.schedulers.uge.qstat_json import parse_jobinfo_json, parse_joblist_json
 
 
@@ -126,3 +130,32 @@ def test_parse_jobinfo_error_json():
 
     # Verify job number
     assert job["job_number"] == 30017756, f"Expected job_number 30017756, got: {job['job_number']}"
+
+
+def test_parse_joblist_json_empty():
+    """Test that output without job sections gives no rows."""
+    assert parse_joblist_json('{"queue_info": [], "job_info": []}') == []
+
+
+def test_parse_joblist_json_invalid():
+    """Test that output which is not JSON is not read as an empty job list."""
+    for stdout in ["", "error: can not reach qmaster", "<?xml version='1.0'?><job_info/>"]:
+        with pytest.raises(json.JSONDecodeError):
+            parse_joblist_json(stdout)
+
+
+def test_parse_json_orjson(monkeypatch: pytest.MonkeyPatch):
+    """Test that the optional orjson decoder gives the same result as json."""
+    orjson = pytest.importorskip("orjson")
+
+    with open(RESOURCES / "uge" / "qstat_joblist.json") as f:
+        joblist = f.read()
+
+    with open(RESOURCES / "uge" / "qstat_jobinfo_array.json") as f:
+        jobinfo = f.read()
+
+    monkeypatch.setattr(qstat_json, "_loads", json.loads)
+    expected = parse_joblist_json(joblist), parse_jobinfo_json(jobinfo)
+
+    monkeypatch.setattr(qstat_json, "_loads", orjson.loads)
+    assert (parse_joblist_json(joblist), parse_jobinfo_json(jobinfo)) == expected
@@ -7,8 +7,12 @@ from hpc_funcs.schedulers.uge.qstat_text import (
     COLUMN_INFO_JOBID,
     COLUMN_INFO_NAME,
     COLUMN_INFO_USER,
+    COLUMN_JOBID,
+    COLUMN_RUNNING,
+    COLUMN_STATE,
     parse_jobinfo_text,
     parse_joblist_text,
+    parse_taskarray,
 )
 
 pd.set_option("display.max_columns", None)
@@ -56,3 +60,38 @@ def test_parse_joblist():
     assert COLUMN_ARRAY in pdf
 
     print(pdf)
+
+    # Same result when streaming lines, e.g. from a pipe
+    with open(filename) as f:
+        assert parse_joblist_text(f) == job_list
+
+
+def test_parse_joblist_no_table():
+    """Output without job lines, e.g. an error message, gives no jobs."""
+
+    assert parse_joblist_text("") == []
+    assert parse_joblist_text("error: can not reach qmaster") == []
+    assert parse_joblist_text(iter(["error: can not reach qmaster\n", "\n"])) == []
+
+    with open(RESOURCES / "uge/qstat_joblist.txt") as f:
+        header = f.readlines()[:2]
+
+    assert parse_joblist_text("".join(header)) == []
+
+
+def test_parse_taskarray():
+    filename = RESOURCES / "uge/qstat_joblist.txt"
+
+    with open(filename) as f:
+        job_list = parse_joblist_text(f.read())
+
+    rows = parse_taskarray(job_list)
+
+    # One row per job id
+    job_ids = [row[COLUMN_JOBID] for row in rows]
+    assert len(job_ids) == len(set(job_ids))
+    assert set(job_ids) == {job[COLUMN_JOBID] for job in job_list}
+
+    # Every running line is one running task
+    n_running = sum(row[COLUMN_RUNNING] for row in rows)
+    assert n_running == sum(job[COLUMN_STATE] == "r" for job in job_list)
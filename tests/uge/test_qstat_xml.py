@@ -36,3 +36,15 @@ def test_parse_jobinfo_xml():
         task = job["JB_ja_tasks"][0]
         assert "JAT_task_number" in task
         assert "JAT_status" in task
+
+
+def test_parse_jobinfo_xml_file():
+    """Test parsing streamed from an open file, as from a string."""
+
+    filename = RESOURCES / "uge" / "qstat_jobinfo_array.xml"
+
+    with open(filename) as f:
+        jobs = parse_jobinfo_xml(f)
+
+    with open(filename) as f:
+        assert jobs == parse_jobinfo_xml(f.read())